@@ -1,9 +1,31 @@
 import solara
-from pages import home, movies, watchlist
+from solara.routing import Router, router_context
+from pages import home, movies, perf, watchlist
 from auth.auth import AuthAvatarMenu
 
+# Admin-only routes, reachable by their URL but never listed in the navigation
+ADMIN_ROUTES = {"debug"}
+
+
+@solara.component
+def Layout(children=[]):
+    """
+    App layout whose navigation only lists the public routes.
+    """
+    router = solara.use_router()
+    path = f"{router.path}?{router.search}" if router.search else router.path
+    public_routes = [route for route in routes if route.path not in ADMIN_ROUTES]
+    # AppLayout builds its navigation tabs from the routes of the current router
+    router_context.provide(Router(path, public_routes, router.set_path))
+    return solara.AppLayout(children=children)
+
+
 routes = [
-    solara.Route(path="/", component=home.Page, label="Home"),
+    solara.Route(path="/", component=home.Page, label="Home", layout=Layout),
     # solara.Route(path="movies", component=movies.Page, label="Movies"),
     solara.Route(path="watchlists", component=watchlist.Page, label="Watchlists"),
+    solara.Route(
+        path="debug",
+        children=[solara.Route(path="perf", component=perf.Page, label="Performance")],
+    ),
 ]
@@ -4,9 +4,11 @@ import os
 import solara
 from solara import lab
 from auth.auth import AuthAvatarMenu
+from utils.profiler import profiled
 
 
 @solara.component
+@profiled
 def AppBar():
     # Set the primary color to orange for both light and dark themes
     lab.theme.themes.light.primary = "#FF9800"  # Orange
@@ -0,0 +1,17 @@
+import solara
+from utils.database.loader import use_loader
+
+
+@solara.component
+def MovieCard(movie_id: int, watched: bool = False):
+    """
+    Display a single movie, resolved through the render's repository loader.
+    """
+    movie = use_loader().get_movie_by_id(movie_id)
+    if not movie:
+        solara.Markdown(f"Unknown movie ({movie_id})")
+        return
+    with solara.Card(movie.title, subtitle=str(movie.release_date or "")):
+        if movie.poster_path:
+            solara.Image(str(movie.poster_path), width="120px")
+        solara.Markdown(f"**Watched**: {'Yes' if watched else 'No'}")
@@ -0,0 +1,68 @@
+"""
+Load test the watchlist app with simulated concurrent sessions.
+
+Run from the shared_watchlist directory against a local mongod, e.g.
+
+    python -m loadtest --sessions 200 --tmdb-latency 0.1 --output report.json
+"""
+import argparse
+import json
+import os
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--searches", type=int, default=3, help="searches per session")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="seconds to start all sessions")
+    parser.add_argument("--tmdb-latency", type=float, default=0.05, help="fake TMDb latency in seconds")
+    parser.add_argument("--movies", type=int, default=1000, help="size of the fake TMDb catalog")
+    parser.add_argument("--mongodb-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="watchlist_loadtest")
+    parser.add_argument(
+        "--write-behind",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="buffer movie cache inserts (the app default)",
+    )
+    parser.add_argument("--keep-data", action="store_true", help="do not drop the database afterwards")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    # db_config reads these at import time, so they are set before importing the app
+    os.environ["MONGODB_URI"] = args.mongodb_uri
+    os.environ["MONGODB_DATABASE"] = args.database
+    os.environ["MOVIE_WRITE_BEHIND"] = "1" if args.write_behind else "0"
+
+    from loadtest.fake_tmdb import FakeTMDbServer, route_tmdb_to
+
+    tmdb = FakeTMDbServer(latency=args.tmdb_latency, movie_count=args.movies)
+    tmdb.start()
+    route_tmdb_to(tmdb.url)
+
+    from loadtest.harness import LoadTest, LoadTestConfig, reset_database
+
+    config = LoadTestConfig(
+        sessions=args.sessions,
+        searches_per_session=args.searches,
+        ramp_up=args.ramp_up,
+        movie_count=args.movies,
+    )
+    reset_database()
+    try:
+        report = LoadTest(config).run()
+        report["tmdb_requests"] = tmdb.request_count
+    finally:
+        tmdb.stop()
+        if not args.keep_data:
+            reset_database()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import json
+import re
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from tmdbv3api import TMDb
+
+TMDB_BASE_URL = "https://api.themoviedb.org"
+
+# Release dates are spread over this range, Movie.release_date must be in the past
+FIRST_RELEASE_DATE = date(1970, 1, 1)
+RELEASE_SPAN_DAYS = (date(2020, 1, 1) - FIRST_RELEASE_DATE).days
+
+
+def fake_movie(movie_id: int) -> Dict:
+    return {
+        "id": movie_id,
+        "title": f"Load Test Movie {movie_id}",
+        "overview": f"Synthetic movie number {movie_id} served by the fake TMDb.",
+        "release_date": (
+            FIRST_RELEASE_DATE + timedelta(days=movie_id * 7 % RELEASE_SPAN_DAYS)
+        ).isoformat(),
+        "poster_path": f"/loadtest-{movie_id}.jpg",
+    }
+
+
+class FakeTMDbServer:
+    """
+    Local stand-in for the TMDb API with a configurable response latency.
+
+    Serves a deterministic catalog of `movie_count` movies for the search,
+    details and recommendations endpoints used by `MongoMovieRepository`.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        movie_count: int = 1000,
+    ):
+        self.latency = latency
+        self.movie_count = movie_count
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-tmdb", daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def search(self, query: str) -> List[Dict]:
+        # "Load Test Movie 42" resolves to movie 42, anything else to a stable id
+        match = re.search(r"(\d+)\s*$", query)
+        movie_id = int(match.group(1)) if match else sum(map(ord, query))
+        return [fake_movie((movie_id - 1) % self.movie_count + 1)]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                time.sleep(server.latency)
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                details = re.fullmatch(r"/3/movie/(\d+)", url.path)
+                recommendations = re.fullmatch(r"/3/movie/(\d+)/recommendations", url.path)
+                if url.path == "/3/search/movie":
+                    results = server.search(params.get("query", [""])[0])
+                    self._reply(200, _page(results))
+                elif details:
+                    self._reply(200, fake_movie(int(details.group(1))))
+                elif recommendations:
+                    movie_id = int(recommendations.group(1))
+                    results = [
+                        fake_movie((movie_id + offset) % server.movie_count + 1)
+                        for offset in range(1, 6)
+                    ]
+                    self._reply(200, _page(results))
+                else:
+                    self._reply(
+                        404, {"success": False, "status_message": "Not found"}
+                    )
+
+            def _reply(self, status: int, body: Dict) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _page(results: List[Dict]) -> Dict:
+    return {
+        "page": 1,
+        "results": results,
+        "total_pages": 1,
+        "total_results": len(results),
+    }
+
+
+class _RedirectAdapter(HTTPAdapter):
+    def __init__(self, target: str):
+        super().__init__()
+        self.target = target
+
+    def send(self, request, **kwargs):
+        request.url = request.url.replace(TMDB_BASE_URL, self.target, 1)
+        return super().send(request, **kwargs)
+
+
+def route_tmdb_to(target: str) -> None:
+    """
+    Send every tmdbv3api request to `target` instead of the real TMDb.
+
+    Must be called before any tmdbv3api object is created, a class that was
+    already instantiated keeps its own session.
+    """
+    session = requests.Session()
+    session.mount(TMDB_BASE_URL, _RedirectAdapter(target))
+    tmdb = TMDb(session=session)
+    tmdb.api_key = "loadtest"
+    # The request cache bypasses the session, so it has to be off
+    tmdb.cache = False
@@ -0,0 +1,253 @@
+import gc
+import math
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import psutil
+import solara
+# Importing the server app applies solara's server patches (per kernel widget
+# registry and comm manager), which virtual kernels rely on to close cleanly
+import solara.server.app  # noqa: F401
+from solara.server import kernel, kernel_context
+from solara_enterprise import auth
+
+from pages import home, watchlist
+from shared_data import user
+from utils.database import repositories
+from utils.database.db_config import MONGODB_DATABASE, client
+from utils.database.users import User
+from utils.database.wathclist import Watchlist
+
+
+@dataclass
+class LoadTestConfig:
+    sessions: int = 100
+    searches_per_session: int = 3
+    ramp_up: float = 5.0
+    movie_count: int = 1000
+    # Seconds a finished session waits for the others before closing
+    session_timeout: float = 300.0
+    # Seconds between server memory samples
+    memory_interval: float = 0.1
+
+
+def synthetic_oauth_response(index: int) -> Dict:
+    """
+    Build the OAuth payload solara_enterprise would store for a logged in user.
+    """
+    return {
+        "userinfo": {
+            "sub": f"loadtest|{index}",
+            "given_name": "Load",
+            "family_name": f"Tester {index}",
+            "nickname": f"loadtester{index}",
+            "name": f"Load Tester {index}",
+            "email": f"loadtester{index}@example.com",
+        }
+    }
+
+
+class LatencyStats:
+    """
+    Thread-safe collection of step latencies and errors.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def measure(self, kind: str, name: str):
+        started = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.samples[f"{kind}:{name}"].append(elapsed)
+
+    def record_error(self, error: Exception) -> None:
+        with self._lock:
+            self.errors[type(error).__name__] += 1
+
+
+class LoadTest:
+    """
+    Drive simulated Solara sessions through login, home, watchlists, search and
+    add item.
+
+    Each session gets its own virtual kernel, the same isolation the Solara
+    server gives a browser tab, and renders the real page components. Sessions
+    run on one thread each and stay open until all of them are done (or
+    `session_timeout` passes), while the server memory is sampled for the
+    whole run; its peak is what N concurrent users cost the server.
+    """
+
+    def __init__(self, config: LoadTestConfig):
+        self.config = config
+        self.stats = LatencyStats()
+        # The app's own repositories, write-behind follows MOVIE_WRITE_BEHIND
+        self.movie_repository = repositories.movie_repository
+        self.watchlist_repository = repositories.watchlist_repository
+        self.completed_sessions = 0
+        self.rss_before = 0
+        self.rss_peak = 0
+        self.rss_after = 0
+        self.barrier_broken = False
+        self._lock = threading.Lock()
+        self._barrier = threading.Barrier(config.sessions)
+        self._running = threading.Event()
+        # Only the events are kept, holding on to the contexts would retain memory
+        self._closed_events: List[threading.Event] = []
+
+    def run(self) -> Dict:
+        self.rss_before = self.rss_peak = psutil.Process().memory_info().rss
+        self._running.set()
+        sampler = threading.Thread(target=self._sample_memory, name="rss-sampler", daemon=True)
+        sampler.start()
+        threads = [
+            threading.Thread(target=self._run_session, args=(index,), name=f"session-{index}")
+            for index in range(self.config.sessions)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+            time.sleep(self.config.ramp_up / self.config.sessions)
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        self._running.clear()
+        sampler.join()
+        # Every session is closed now, what is left above the baseline leaked
+        gc.collect()
+        self.rss_after = psutil.Process().memory_info().rss
+        if self.movie_repository.write_behind:
+            self.movie_repository.write_behind.stop()
+        return self.report(elapsed)
+
+    def report(self, elapsed: float) -> Dict:
+        steps = {}
+        total_steps = 0
+        for name, samples in sorted(self.stats.samples.items()):
+            samples = sorted(samples)
+            total_steps += len(samples)
+            steps[name] = {
+                "count": len(samples),
+                "p50_ms": percentile(samples, 50) * 1e3,
+                "p95_ms": percentile(samples, 95) * 1e3,
+                "p99_ms": percentile(samples, 99) * 1e3,
+                "max_ms": samples[-1] * 1e3,
+            }
+        report = {
+            "sessions": self.config.sessions,
+            "completed_sessions": self.completed_sessions,
+            # Sessions timed out waiting for each other, so not all of them
+            # were open at the same time
+            "barrier_broken": self.barrier_broken,
+            "errors": dict(self.stats.errors),
+            "elapsed_seconds": elapsed,
+            "steps_per_second": total_steps / elapsed if elapsed else 0.0,
+            "sessions_per_second": self.completed_sessions / elapsed if elapsed else 0.0,
+            "rss_before_mb": self.rss_before / 2**20,
+            "rss_peak_mb": self.rss_peak / 2**20,
+            "rss_per_session_kb": (self.rss_peak - self.rss_before)
+            / self.config.sessions
+            / 2**10,
+            "rss_after_close_mb": self.rss_after / 2**20,
+            "unclosed_kernels": sum(not closed.is_set() for closed in self._closed_events),
+            "steps": steps,
+        }
+        if self.movie_repository.write_behind:
+            report["write_behind"] = self.movie_repository.write_behind.metrics()
+        return report
+
+    def _run_session(self, index: int) -> None:
+        context = kernel_context.VirtualKernelContext(
+            id=f"loadtest-{index}",
+            kernel=kernel.Kernel(),
+            session_id=f"loadtest-session-{index}",
+        )
+        with self._lock:
+            self._closed_events.append(context.closed_event)
+        rc = None
+        try:
+            with context:
+                with self.stats.measure("page", "home"):
+                    _, rc = solara.render(home.Page(), handle_error=False)
+                # Stub for the OAuth callback: store the user like solara_enterprise does
+                with self.stats.measure("action", "login"):
+                    auth.user.value = synthetic_oauth_response(index)
+                if not isinstance(user.value, User):
+                    raise RuntimeError(f"Session {index} did not log in")
+                rc.close()
+                rc = None
+
+                with self.stats.measure("page", "watchlists"):
+                    _, rc = solara.render(watchlist.Page(), handle_error=False)
+                with self.stats.measure("action", "create_watchlist"):
+                    watchlist_id = self._create_watchlist(user.value.id)
+
+                for _ in range(self.config.searches_per_session):
+                    title = f"Load Test Movie {random.randint(1, self.config.movie_count)}"
+                    with self.stats.measure("action", "search"):
+                        movie = self.movie_repository.search_and_cache_movie(title)
+                    if movie is None:
+                        raise RuntimeError(f"Search for '{title}' returned nothing")
+                    with self.stats.measure("action", "add_item"):
+                        self.watchlist_repository.add_item(watchlist_id, movie.id)
+            with self._lock:
+                self.completed_sessions += 1
+        except Exception as e:
+            self.stats.record_error(e)
+        finally:
+            try:
+                self._barrier.wait(self.config.session_timeout)
+            except threading.BrokenBarrierError:
+                self.barrier_broken = True
+            if rc is not None:
+                with context:
+                    rc.close()
+            context.close()
+
+    def _create_watchlist(self, owner_id: str) -> str:
+        watchlist = Watchlist(
+            id=str(uuid.uuid4()),
+            name="Load test watchlist",
+            owner_id=owner_id,
+            collaborators=[],
+            items=[],
+        )
+        self.watchlist_repository.create_watchlist(owner_id, watchlist)
+        document = self.watchlist_repository.collection.find_one({"id": watchlist.id})
+        return str(document["_id"])
+
+    def _sample_memory(self) -> None:
+        process = psutil.Process()
+        while self._running.is_set():
+            self.rss_peak = max(self.rss_peak, process.memory_info().rss)
+            time.sleep(self.config.memory_interval)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q * len(sorted_values) / 100) - 1))
+    return sorted_values[rank]
+
+
+def reset_database(database: Optional[str] = None) -> None:
+    """
+    Drop the load test database, refusing to touch the application database.
+    """
+    database = database or MONGODB_DATABASE
+    if database == "watchlist_db":
+        raise ValueError("Refusing to drop the application database")
+    client.drop_database(database)
@@ -0,0 +1,15 @@
+import pytest
+
+from loadtest.harness import percentile
+
+
+@pytest.mark.parametrize(
+    "count, q, expected",
+    [(30, 95, 28), (150, 99, 148), (100, 95, 94), (20, 50, 9), (1, 99, 0), (10, 100, 9)],
+)
+def test_percentile_is_nearest_rank(count, q, expected):
+    assert percentile(list(range(count)), q) == expected
+
+
+def test_percentile_of_no_samples():
+    assert percentile([], 95) == 0.0
@@ -6,13 +6,16 @@ from components.appbar import AppBar
 from auth.auth import get_current_user, LoginButton
 from shared_data import user
 from utils.database.users import User
+from utils.profiler import profiled, use_profiled_reactive
 
 
 @solara.component
+@profiled
 def Page():
     """
     Welcome Page for the Movie Watchlist App.
     """
+    use_profiled_reactive("shared_data.user", user)
     AppBar()
     with solara.Column(align="center"):
         if not get_current_user():
@@ -0,0 +1,113 @@
+import solara
+from components.appbar import AppBar
+from auth.auth import get_current_user, LoginButton
+from utils.database import repositories
+from utils.profiler import PROFILING_ENABLED, is_profiling_admin, profiler
+
+
+@solara.component
+def StatsTable(title: str, rows: dict):
+    with solara.Card(title):
+        if not rows:
+            solara.Markdown("Nothing recorded yet.")
+            return
+        # Repository calls also report self time, excluding nested calls
+        with_self = all("self_seconds" in stats for stats in rows.values())
+        lines = [
+            "| Name | Count | Total (ms) | "
+            + ("Self (ms) | " if with_self else "")
+            + "Mean (ms) | Max (ms) |",
+            "| --- | ---: | ---: | " + ("---: | " if with_self else "") + "---: | ---: |",
+        ]
+        for name, stats in sorted(
+            rows.items(), key=lambda item: item[1]["total_seconds"], reverse=True
+        ):
+            mean = stats["total_seconds"] / stats["count"] if stats["count"] else 0.0
+            self_time = f"{stats['self_seconds'] * 1e3:.1f} | " if with_self else ""
+            lines.append(
+                f"| `{name}` | {stats['count']} | {stats['total_seconds'] * 1e3:.1f} "
+                f"| {self_time}{mean * 1e3:.2f} | {stats['max_seconds'] * 1e3:.2f} |"
+            )
+        solara.Markdown("\n".join(lines))
+
+
+@solara.component
+def WriteBehindStats(metrics: dict):
+    with solara.Card("Movie cache write-behind"):
+        if not metrics:
+            solara.Markdown("Write-behind is disabled, movies are inserted synchronously.")
+            return
+        lines = ["| Metric | Value |", "| --- | ---: |"]
+        for name, value in metrics.items():
+            if name.endswith("_seconds"):
+                lines.append(f"| {name[: -len('_seconds')]} (ms) | {value * 1e3:.2f} |")
+            else:
+                lines.append(f"| {name} | {value} |")
+        solara.Markdown("\n".join(lines))
+
+
+@solara.component
+def Page():
+    """
+    Admin-only page showing render and repository profiling data and the
+    movie cache write-behind metrics.
+    """
+    refresh = solara.use_reactive(0)
+
+    AppBar()
+
+    with solara.Column(align="center"):
+        current_user = get_current_user()
+        if not current_user:
+            solara.Markdown("# Please Log In before accessing the application!")
+            LoginButton()
+            return
+        if not is_profiling_admin(current_user.get("userinfo", {}).get("email")):
+            solara.Error("You are not allowed to view this page.")
+            return
+
+    # Reading the counter makes the refresh button trigger a re-render
+    _ = refresh.value
+    write_behind = repositories.movie_repository.write_behind
+
+    solara.Button("Refresh", icon_name="mdi-refresh", on_click=lambda: refresh.set(refresh.value + 1))
+    WriteBehindStats(write_behind.metrics() if write_behind else {})
+
+    if not PROFILING_ENABLED:
+        solara.Info("Profiling is disabled, start the app with WATCHLIST_PROFILE=1.")
+        return
+
+    summary = profiler.summary()
+
+    def reset():
+        profiler.reset()
+        refresh.set(refresh.value + 1)
+
+    with solara.Row():
+        solara.Button("Reset", icon_name="mdi-delete", on_click=reset)
+        solara.FileDownload(
+            profiler.to_json, filename="perf-summary.json", label="Download JSON"
+        )
+        solara.FileDownload(
+            profiler.to_trace, filename="perf-trace.json", label="Download trace"
+        )
+
+    StatsTable("Component renders", summary["renders"])
+    StatsTable("Repository calls", summary["repository_calls"])
+
+    with solara.Card("Repository time per component"):
+        lines = ["| Component | Repository (ms) |", "| --- | ---: |"]
+        for component, stats in summary["renders"].items():
+            lines.append(f"| `{component}` | {stats['repository_seconds'] * 1e3:.1f} |")
+        solara.Markdown("\n".join(lines))
+
+    with solara.Card("Reactive variable fan-out"):
+        if not summary["reactive_changes"]:
+            solara.Markdown("Nothing recorded yet.")
+        for name, change in summary["reactive_changes"].items():
+            fan_out = ", ".join(
+                f"`{component}` × {count}" for component, count in change["fan_out"].items()
+            )
+            solara.Markdown(
+                f"**{name}**: {change['changes']} changes → {fan_out or 'no renders'}"
+            )
@@ -0,0 +1,76 @@
+import solara
+
+from pages.watchlist import WatchlistComponent, sort_watchlist_items
+from utils.database import repositories
+from utils.database.catalog import MovieCatalog
+from utils.database.movies import Movie
+from utils.database.wathclist import Watchlist, WatchlistItem
+
+
+class MovieDocuments:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query=None, projection=None):
+        return [dict(doc) for doc in self.docs]
+
+
+class CountingMovieRepository:
+    def __init__(self, docs=()):
+        self.calls = []
+        self.collection = MovieDocuments(list(docs))
+
+    def subscribe(self, listener):
+        pass
+
+    def get_movies_by_ids(self, movie_ids):
+        self.calls.append(sorted(movie_ids))
+        return {movie_id: Movie(id=movie_id, title=f"Movie {movie_id}") for movie_id in movie_ids}
+
+
+def test_movie_cards_share_one_query_per_render(monkeypatch):
+    movie_repository = CountingMovieRepository()
+    monkeypatch.setattr(repositories, "movie_repository", movie_repository)
+    monkeypatch.setattr(repositories, "_movie_catalog", MovieCatalog(movie_repository))
+    watchlists = [
+        Watchlist(
+            id=str(index),
+            name=f"List {index}",
+            owner_id="owner",
+            collaborators=[],
+            items=[WatchlistItem(movie_id=movie_id, watched=False) for movie_id in (1, 2, 3, index)],
+        )
+        for index in range(10, 15)
+    ]
+
+    box, rc = solara.render(WatchlistComponent(solara.Reactive(watchlists)), handle_error=False)
+
+    assert movie_repository.calls == [[1, 2, 3, 10, 11, 12, 13, 14]]
+    assert len(rc.find(children=["Movie 1"]).widgets) == 5
+    rc.close()
+
+
+def test_items_are_sorted_with_the_catalog():
+    catalog = MovieCatalog(
+        CountingMovieRepository(
+            [
+                {"id": 1, "title": "Heat", "release_date": "1975-12-15"},
+                {"id": 2, "title": "Alien", "release_date": "1979-05-25"},
+                {"id": 3, "title": "Brazil", "release_date": "1985-02-20"},
+            ]
+        )
+    )
+    items = [
+        WatchlistItem(movie_id=1, watched=False),
+        WatchlistItem(movie_id=2, watched=True),
+        WatchlistItem(movie_id=3, watched=False),
+        # Not cataloged yet, e.g. still being written
+        WatchlistItem(movie_id=4, watched=False),
+    ]
+
+    def ids(by, hide_watched):
+        return [item.movie_id for item in sort_watchlist_items(catalog, items, by, hide_watched)]
+
+    assert ids("title", False) == [2, 3, 1, 4]
+    assert ids("release_date", False) == [1, 2, 3, 4]
+    assert ids("title", True) == [3, 1, 4]
@@ -3,18 +3,60 @@ from solara import Reactive
 from typing import List
 from components.appbar import AppBar
 from auth.auth import get_current_user, LoginButton
+from components.movie_card import MovieCard
+from utils.database.catalog import MovieCatalog
+from utils.database.loader import use_repository_loader
+from utils.database.repositories import get_movie_catalog, watchlist_repository
+from utils.database.users import User
 from utils.database.wathclist import Watchlist, WatchlistItem
 from utils.database.movies import Movie
+from utils.profiler import profiled, use_profiled_reactive
 
 @solara.component
 def SearchForMovieComponent(results: Reactive[List[Movie]]):
     pass
 
+def sort_watchlist_items(
+    catalog: MovieCatalog, items: List[WatchlistItem], by: str, hide_watched: bool
+) -> List[WatchlistItem]:
+    """
+    Order watchlist items with the movie catalog instead of loading their
+    movies. Items whose movie is not in the catalog yet are listed last.
+    """
+    items_by_id = {item.movie_id: item for item in items}
+    watched_ids = [movie_id for movie_id, item in items_by_id.items() if item.watched]
+    rows = catalog.filter(ids=items_by_id, exclude_ids=watched_ids if hide_watched else None)
+    ordered = [items_by_id[movie_id] for movie_id in catalog.ids[catalog.sort(rows, by=by)].tolist()]
+    cataloged = set(catalog.ids[catalog.filter(ids=items_by_id)].tolist())
+    ordered.extend(
+        item
+        for movie_id, item in items_by_id.items()
+        if movie_id not in cataloged and not (hide_watched and item.watched)
+    )
+    return ordered
+
 @solara.component
 def WatchlistComponent(watchlists: Reactive[List[Watchlist]]):
-    pass
+    sort_by = solara.use_reactive("title")
+    hide_watched = solara.use_reactive(False)
+    catalog = get_movie_catalog()
+    loader = use_repository_loader()
+    # Fetch the movies of every card below with a single query
+    loader.movies.prime(
+        item.movie_id for watchlist in watchlists.value for item in watchlist.items
+    )
+    with solara.Row():
+        solara.Select("Sort by", value=sort_by, values=["title", "release_date"])
+        solara.Checkbox(label="Hide watched", value=hide_watched)
+    for watchlist in watchlists.value:
+        with solara.Card(watchlist.name):
+            for item in sort_watchlist_items(
+                catalog, watchlist.items, sort_by.value, hide_watched.value
+            ):
+                MovieCard(item.movie_id, item.watched)
 
 @solara.component
+@profiled
 def Page():
     """
     Watchlist Page for creating, editing, and sharing watchlists.
@@ -25,6 +67,17 @@ def Page():
     selected_watchlist = solara.use_reactive(None)
     shared_with = solara.use_reactive("")
     message = solara.use_reactive("")
+    stored_watchlists = solara.use_reactive([])
+    use_profiled_reactive("watchlist.watchlists", watchlists)
+    use_profiled_reactive("watchlist.selected_watchlist", selected_watchlist)
+
+    def load_stored_watchlists():
+        current_user = get_current_user()
+        if current_user:
+            user_id = User.from_oauth_response(current_user).id
+            stored_watchlists.set(watchlist_repository.get_all(user_id))
+
+    solara.use_effect(load_stored_watchlists, [])
 
     # Shared AppBar
     AppBar()
@@ -98,7 +151,7 @@ def Page():
 
         # List of watchlists
         with solara.Card("Your Watchlists"):
-            if not watchlists.value:
+            if not watchlists.value and not stored_watchlists.value:
                 solara.Markdown("You have no watchlists yet.")
             else:
                 for watchlist in watchlists.value:
@@ -115,6 +168,7 @@ def Page():
                         solara.Button(
                             "Share", on_click=lambda w=watchlist: selected_watchlist.set(w)
                         )
+            WatchlistComponent(stored_watchlists)
 
         # Form to share a watchlist
         if selected_watchlist.value:
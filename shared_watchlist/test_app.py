@@ -0,0 +1,23 @@
+import ipyvuetify as v
+import solara
+from solara.routing import Router
+
+import app
+from pages import perf
+
+
+def test_navigation_does_not_list_admin_routes():
+    # A title and no tabs of its own make AppLayout build tabs from the routes
+    main = solara.RoutingProvider(
+        routes=app.routes,
+        pathname="/",
+        children=[app.Layout(children=[solara.Title("The Watchlist"), solara.Text("Content")])],
+    )
+    box, rc = solara.render(main, handle_error=False)
+    assert [tab.children for tab in rc.find(v.Tab).widgets] == [["Home"], ["watchlists"]]
+    rc.close()
+
+
+def test_admin_routes_are_reachable_by_url():
+    router = Router("/debug/perf", app.routes)
+    assert router.path_routes[-1].component is perf.Page
@@ -0,0 +1,337 @@
+import threading
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from utils.database.movies import MongoMovieRepository, Movie
+
+# Titles are sorted on the first this many bytes of their casefolded UTF-8 form
+TITLE_KEY_LENGTH = 32
+INITIAL_CAPACITY = 1024
+
+
+class MovieCatalog:
+    """
+    Columnar, in-memory view of the cached movies collection.
+
+    Only the movie id, release date and casefolded title are kept, in NumPy
+    arrays, so filtering and sorting never has to materialize `Movie`
+    objects. The titles are packed into one UTF-8 byte buffer (row `i` spans
+    `offsets[i]:offsets[i + 1]`), fixed width sort keys are cut from it only
+    when sorting. A row costs a few dozen bytes instead of the ~750 bytes of
+    a `Movie`.
+    Full `Movie` instances are loaded from the repository only for the rows
+    that are actually displayed (see `page`).
+
+    The catalog is loaded from the collection on creation and is safe to
+    share between sessions. Rows are only ever appended or updated in place,
+    so row indices stay valid until the next `refresh`.
+    """
+
+    def __init__(self, repository: MongoMovieRepository):
+        self.repository = repository
+        self._lock = threading.RLock()
+        self._size = 0
+        self._ids = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        self._release_dates = np.empty(INITIAL_CAPACITY, dtype="datetime64[D]")
+        self._title_offsets = np.zeros(INITIAL_CAPACITY + 1, dtype=np.uint32)
+        self._title_bytes = np.empty(INITIAL_CAPACITY * 16, dtype=np.uint8)
+        # Subscribe first so movies inserted while loading are not missed
+        self.repository.subscribe(self.add)
+        self.refresh()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size
+
+    @property
+    def ids(self) -> np.ndarray:
+        with self._lock:
+            return self._ids[: self._size]
+
+    @property
+    def release_dates(self) -> np.ndarray:
+        with self._lock:
+            return self._release_dates[: self._size]
+
+    @property
+    def title_keys(self) -> np.ndarray:
+        with self._lock:
+            return self._title_keys(np.arange(self._size))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory held by the catalog columns, including unused capacity.
+        """
+        with self._lock:
+            return sum(
+                column.nbytes
+                for column in (
+                    self._ids,
+                    self._release_dates,
+                    self._title_offsets,
+                    self._title_bytes,
+                )
+            )
+
+    def refresh(self) -> None:
+        """
+        Rebuild all columns from the movies collection.
+        """
+        cursor = self.repository.collection.find(
+            {}, {"_id": 0, "id": 1, "title": 1, "release_date": 1}
+        )
+        with self._lock:
+            docs = {doc["id"]: doc for doc in cursor}
+            titles = [_encode_title(doc.get("title")) for doc in docs.values()]
+            size = len(docs)
+            self._ids = np.fromiter(docs, dtype=np.int64, count=size)
+            self._release_dates = np.array(
+                [_to_datetime64(doc.get("release_date")) for doc in docs.values()],
+                dtype="datetime64[D]",
+            )
+            self._title_offsets = np.zeros(size + 1, dtype=np.uint32)
+            self._title_offsets[1:] = np.cumsum(
+                np.fromiter(map(len, titles), dtype=np.int64, count=size)
+            )
+            self._title_bytes = np.frombuffer(b"".join(titles), dtype=np.uint8).copy()
+            self._size = size
+
+    def add(self, movie: Movie) -> None:
+        """
+        Insert or update a single movie without rebuilding the catalog.
+
+        Args:
+            movie (Movie): The movie that was inserted into the collection.
+        """
+        with self._lock:
+            self._upsert(movie.id, movie.title, movie.release_date)
+
+    def filter(
+        self,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        title_contains: Optional[str] = None,
+        ids: Optional[Iterable[int]] = None,
+        exclude_ids: Optional[Iterable[int]] = None,
+    ) -> np.ndarray:
+        """
+        Select catalog rows matching every given criterion.
+
+        Watched state lives on watchlist items, so pass the ids of watched
+        (or unwatched) items as `ids` / `exclude_ids` to filter on it.
+
+        Args:
+            year_from (Optional[int]): Earliest release year, inclusive.
+            year_to (Optional[int]): Latest release year, inclusive.
+            title_contains (Optional[str]): Case-insensitive substring of the full title.
+            ids (Optional[Iterable[int]]): Keep only these movie ids.
+            exclude_ids (Optional[Iterable[int]]): Drop these movie ids.
+
+        Returns:
+            np.ndarray: Indices of the matching rows.
+        """
+        with self._lock:
+            size = self._size
+            movie_ids = self._ids[:size]
+            release_dates = self._release_dates[:size]
+            title_offsets = self._title_offsets[: size + 1]
+            title_bytes = self._title_bytes[: title_offsets[-1]]
+
+        mask = np.ones(size, dtype=bool)
+        if year_from is not None or year_to is not None:
+            years = release_dates.astype("datetime64[Y]").astype(np.int64) + 1970
+            mask &= ~np.isnat(release_dates)
+            if year_from is not None:
+                mask &= years >= year_from
+            if year_to is not None:
+                mask &= years <= year_to
+        if title_contains:
+            mask &= _contains(title_bytes, title_offsets, _encode_title(title_contains))
+        if ids is not None:
+            mask &= np.isin(movie_ids, np.fromiter(ids, dtype=np.int64))
+        if exclude_ids is not None:
+            mask &= ~np.isin(movie_ids, np.fromiter(exclude_ids, dtype=np.int64))
+        return np.flatnonzero(mask)
+
+    def sort(
+        self,
+        rows: Optional[np.ndarray] = None,
+        by: str = "title",
+        descending: bool = False,
+    ) -> np.ndarray:
+        """
+        Order rows by title or release date. Movies without a release date
+        are always placed last.
+
+        Args:
+            rows (Optional[np.ndarray]): Row indices to sort, defaults to all rows.
+            by (str): Either "title" or "release_date".
+            descending (bool): Reverse the sort order.
+
+        Returns:
+            np.ndarray: The row indices in sorted order.
+        """
+        if rows is None:
+            rows = np.arange(len(self))
+        keys = self._sort_keys(rows, by, descending)
+        order = np.argsort(keys, kind="stable")
+        return rows[order]
+
+    def top_k(
+        self,
+        k: int,
+        rows: Optional[np.ndarray] = None,
+        by: str = "release_date",
+        descending: bool = True,
+    ) -> np.ndarray:
+        """
+        Return the first `k` rows of `sort(rows, by, descending)` without
+        sorting the whole selection.
+        """
+        if rows is None:
+            rows = np.arange(len(self))
+        if k <= 0:
+            return rows[:0]
+        if k >= rows.size:
+            return self.sort(rows, by, descending)
+        keys = self._sort_keys(rows, by, descending)
+        candidates = np.argpartition(keys, k - 1)[:k]
+        order = np.argsort(keys[candidates], kind="stable")
+        return rows[candidates[order]]
+
+    def page(self, rows: np.ndarray, offset: int = 0, limit: int = 20) -> List[Movie]:
+        """
+        Build `Movie` objects for a single page of rows.
+
+        Args:
+            rows (np.ndarray): Row indices, as returned by `filter`/`sort`.
+            offset (int): Index of the first row of the page.
+            limit (int): Maximum number of movies on the page.
+
+        Returns:
+            List[Movie]: The movies of the page, in the order of `rows`.
+        """
+        with self._lock:
+            page_ids = self._ids[rows[offset : offset + limit]].tolist()
+        if not page_ids:
+            return []
+        movies = self.repository.get_movies_by_ids(page_ids)
+        return [movies[movie_id] for movie_id in page_ids if movie_id in movies]
+
+    def _sort_keys(self, rows: np.ndarray, by: str, descending: bool) -> np.ndarray:
+        if by == "title":
+            with self._lock:
+                title_keys = self._title_keys(rows)
+            keys = np.unique(title_keys, return_inverse=True)[1]
+            return -keys if descending else keys
+        if by == "release_date":
+            with self._lock:
+                dates = self._release_dates[rows]
+            keys = dates.astype(np.int64)
+            if descending:
+                keys = -keys
+            # NaT is the minimum int64 value, push it to the end either way
+            keys[np.isnat(dates)] = np.iinfo(np.int64).max
+            return keys
+        raise ValueError(f"Cannot sort movie catalog by '{by}'")
+
+    def _title_keys(self, rows: np.ndarray) -> np.ndarray:
+        # Callers hold the lock. Gathers the first TITLE_KEY_LENGTH bytes of
+        # each title, zero padded, and views them as fixed width byte strings.
+        starts = self._title_offsets[rows].astype(np.int64)
+        lengths = self._title_offsets[rows + 1].astype(np.int64) - starts
+        columns = np.arange(TITLE_KEY_LENGTH)
+        keys = np.zeros((rows.size, TITLE_KEY_LENGTH), dtype=np.uint8)
+        if self._title_bytes.size:
+            positions = np.minimum(starts[:, None] + columns, self._title_bytes.size - 1)
+            keys = np.where(columns < lengths[:, None], self._title_bytes[positions], keys)
+        return keys.view(f"S{TITLE_KEY_LENGTH}").ravel()
+
+    def _upsert(self, movie_id: int, title: Optional[str], release_date) -> None:
+        # Callers hold the lock
+        encoded = _encode_title(title)
+        rows = np.flatnonzero(self._ids[: self._size] == movie_id)
+        if not rows.size:
+            self._append(movie_id, encoded, release_date)
+            return
+        row = rows[0]
+        self._release_dates[row] = _to_datetime64(release_date)
+        start, end = self._title_offsets[row : row + 2]
+        if self._title_bytes[start:end].tobytes() != encoded:
+            self._replace_title(row, encoded)
+
+    def _append(self, movie_id: int, encoded: bytes, release_date) -> None:
+        row = self._size
+        start = int(self._title_offsets[row])
+        if row >= self._ids.size:
+            capacity = row + 1 + row // 2
+            self._ids = _grow(self._ids, capacity)
+            self._release_dates = _grow(self._release_dates, capacity)
+            self._title_offsets = _grow(self._title_offsets, capacity + 1)
+        if start + len(encoded) > self._title_bytes.size:
+            self._title_bytes = _grow(
+                self._title_bytes, start + len(encoded) + self._title_bytes.size // 2
+            )
+        self._ids[row] = movie_id
+        self._release_dates[row] = _to_datetime64(release_date)
+        self._title_bytes[start : start + len(encoded)] = np.frombuffer(encoded, dtype=np.uint8)
+        self._title_offsets[row + 1] = start + len(encoded)
+        self._size += 1
+
+    def _replace_title(self, row: int, encoded: bytes) -> None:
+        # Titles hardly ever change, so the buffer is simply rebuilt. New
+        # arrays are built so views handed out by `filter` stay consistent.
+        offsets = self._title_offsets.copy()
+        start, end = int(offsets[row]), int(offsets[row + 1])
+        self._title_bytes = np.concatenate(
+            (
+                self._title_bytes[:start],
+                np.frombuffer(encoded, dtype=np.uint8),
+                self._title_bytes[end : offsets[self._size]],
+            )
+        )
+        shifted = offsets[row + 1 : self._size + 1].astype(np.int64)
+        offsets[row + 1 : self._size + 1] = shifted + len(encoded) - (end - start)
+        self._title_offsets = offsets
+
+
+def _contains(haystack: np.ndarray, offsets: np.ndarray, needle: bytes) -> np.ndarray:
+    """
+    Vectorized substring search over packed titles, returns a row mask.
+    """
+    mask = np.zeros(offsets.size - 1, dtype=bool)
+    needle_bytes = np.frombuffer(needle, dtype=np.uint8)
+    # Candidate start positions, narrowed down one needle byte at a time
+    last_start = max(haystack.size - needle_bytes.size + 1, 0)
+    positions = np.flatnonzero(haystack[:last_start] == needle_bytes[0])
+    for index in range(1, needle_bytes.size):
+        positions = positions[haystack[positions + index] == needle_bytes[index]]
+    rows = np.searchsorted(offsets[1:], positions, side="right")
+    # Drop matches that run across the end of a title into the next one
+    rows = rows[positions + needle_bytes.size <= offsets[rows + 1]]
+    mask[rows] = True
+    return mask
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.zeros(capacity, dtype=array.dtype)
+    grown[: array.size] = array
+    return grown
+
+
+def _encode_title(title: Optional[str]) -> bytes:
+    # UTF-8 keeps code point order, so byte keys sort like the casefolded titles
+    return (title or "").casefold().encode()
+
+
+def _to_datetime64(value) -> np.datetime64:
+    if value is None or value == "":
+        return np.datetime64("NaT", "D")
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return np.datetime64(value, "D")
+    return np.datetime64(str(value)[:10], "D")
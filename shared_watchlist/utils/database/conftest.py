@@ -0,0 +1,86 @@
+import threading
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+
+class FakeCollection:
+    """
+    In-memory stand-in for the small part of a pymongo `Collection` the
+    repositories use, documents are unique by `id`.
+    """
+
+    def __init__(self, docs: Optional[List[Dict]] = None):
+        self.docs: List[Dict] = list(docs or [])
+        self.find_calls = 0
+        self.insert_many_calls = 0
+        # Exceptions raised by the next insert_many calls, one per call
+        self.insert_errors: List[Exception] = []
+        # When set, insert_many waits for it before writing
+        self.release: Optional[threading.Event] = None
+        self.inserting = threading.Event()
+
+    def find(self, query: Optional[Dict] = None, projection: Optional[Dict] = None):
+        self.find_calls += 1
+        return [dict(doc) for doc in self.docs if _matches(doc, query or {})]
+
+    def find_one(self, query: Dict) -> Optional[Dict]:
+        for doc in self.docs:
+            if _matches(doc, query):
+                return dict(doc)
+        return None
+
+    def insert_one(self, doc: Dict) -> None:
+        if self.find_one({"id": doc["id"]}):
+            raise DuplicateKeyError("duplicate id")
+        self.docs.append(dict(doc))
+
+    def insert_many(self, docs: List[Dict], ordered: bool = True) -> None:
+        self.insert_many_calls += 1
+        self.inserting.set()
+        if self.release is not None:
+            self.release.wait(5)
+        if self.insert_errors:
+            raise self.insert_errors.pop(0)
+        errors = []
+        for index, doc in enumerate(docs):
+            if self.find_one({"id": doc["id"]}):
+                errors.append({"index": index, "code": 11000})
+            else:
+                self.docs.append(dict(doc))
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    def delete_one(self, query: Dict):
+        for doc in self.docs:
+            if _matches(doc, query):
+                self.docs.remove(doc)
+                return SimpleNamespace(deleted_count=1)
+        return SimpleNamespace(deleted_count=0)
+
+
+def _matches(doc: Dict, query: Dict) -> bool:
+    for key, condition in query.items():
+        if isinstance(condition, dict) and "$in" in condition:
+            if doc.get(key) not in condition["$in"]:
+                return False
+        elif doc.get(key) != condition:
+            return False
+    return True
+
+
+@pytest.fixture
+def fake_collection() -> FakeCollection:
+    return FakeCollection()
+
+
+@pytest.fixture
+def movie_docs() -> List[Dict]:
+    return [
+        {"id": 1, "title": "The Lord of the Rings: The Fellowship of the Ring", "release_date": "2001-12-19"},
+        {"id": 2, "title": "Alien", "release_date": "1979-05-25"},
+        {"id": 3, "title": "Brazil", "release_date": None},
+        {"id": 4, "title": "alien resurrection", "release_date": "1997-11-26"},
+    ]
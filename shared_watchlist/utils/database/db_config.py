@@ -5,8 +5,14 @@ import os
 # Retrieve the MongoDB URI from environment variables or use a default
 MONGODB_URI = os.environ.get("MONGODB_URI", "mongodb://localhost:27017")
 
+# Database name, overridable so load tests do not write into the real data
+MONGODB_DATABASE = os.environ.get("MONGODB_DATABASE", "watchlist_db")
+
+# Buffer movie cache inserts and write them in the background, 0 writes them synchronously
+MOVIE_WRITE_BEHIND = os.environ.get("MOVIE_WRITE_BEHIND", "1") != "0"
+
 # Create a single MongoClient instance
 client = MongoClient(MONGODB_URI)
 
 # Access the desired database
-db = client["watchlist_db"]
+db = client[MONGODB_DATABASE]
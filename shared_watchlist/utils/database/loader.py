@@ -0,0 +1,170 @@
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar, cast
+
+import solara
+
+from utils.database import repositories
+from utils.database.movies import IMovieRepository, Movie
+from utils.database.users import IUserRepository, User
+from utils.database.wathclist import IWatchlistRepository, Watchlist
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Batch and cache point lookups against a single collection.
+
+    Keys passed to `prime` are only queued. The next `load`/`load_many` that
+    misses the cache fetches every queued key together with its own in one
+    call to `batch_fn`, so N components asking for N ids cost one query.
+    Results (including misses) are cached for the lifetime of the loader.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[K]], Dict[K, V]]):
+        self.batch_fn = batch_fn
+        self.dispatch_count = 0
+        self._cache: Dict[K, Optional[V]] = {}
+        self._queue: Dict[K, None] = {}
+
+    def prime(self, keys: Iterable[K]) -> None:
+        """
+        Queue keys to be fetched with the next batch.
+
+        Args:
+            keys (Iterable[K]): The keys a component is going to load.
+        """
+        for key in keys:
+            if key not in self._cache:
+                self._queue[key] = None
+
+    def load(self, key: K) -> Optional[V]:
+        """
+        Return the value for a key, or None if it does not exist.
+        """
+        return self.load_many([key])[0]
+
+    def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        """
+        Return the values for several keys, fetching the misses in one batch.
+        """
+        keys = list(keys)
+        self.prime(keys)
+        if any(key not in self._cache for key in keys):
+            self._dispatch()
+        return [self._cache[key] for key in keys]
+
+    def clear(self) -> None:
+        """
+        Forget every cached value, e.g. after a write.
+        """
+        self._cache.clear()
+        self._queue.clear()
+
+    def _dispatch(self) -> None:
+        batch = list(self._queue)
+        self._queue.clear()
+        results = self.batch_fn(batch)
+        self.dispatch_count += 1
+        for key in batch:
+            self._cache[key] = results.get(key)
+
+
+class RepositoryLoader:
+    """
+    Render-scoped batching front for the movie, user and watchlist repositories.
+
+    In components use `use_repository_loader()` in the component that knows
+    which ids a render needs, `prime` them there, and `use_loader()` in the
+    child components (cards) to resolve single ids through the same methods
+    they would call on the repositories. All primed ids are fetched with one
+    query per collection on the first lookup, so round trips scale with the
+    number of collections touched, not with the number of components.
+    Do not keep a loader across renders, its cache never expires.
+    """
+
+    def __init__(
+        self,
+        movie_repository: IMovieRepository,
+        user_repository: IUserRepository,
+        watchlist_repository: IWatchlistRepository,
+    ):
+        self.movies: DataLoader[int, Movie] = DataLoader(
+            movie_repository.get_movies_by_ids
+        )
+        self.users: DataLoader[str, User] = DataLoader(
+            user_repository.get_users_by_ids
+        )
+        self.watchlists: DataLoader[str, Watchlist] = DataLoader(
+            watchlist_repository.get_watchlists_by_ids
+        )
+
+    def get_movie_by_id(self, movie_id: int) -> Optional[Movie]:
+        return self.movies.load(movie_id)
+
+    def get_user(self, user_id: str) -> User:
+        user = self.users.load(user_id)
+        if not user:
+            raise ValueError(f"User with id {user_id} not found")
+        return user
+
+    def get_watchlist_by_id(self, watchlist_id: str) -> Watchlist:
+        watchlist = self.watchlists.load(watchlist_id)
+        if not watchlist:
+            raise ValueError("Watchlist not found")
+        return watchlist
+
+    def dispatch_count(self) -> int:
+        """
+        Return the number of database round trips made by this loader.
+        """
+        return (
+            self.movies.dispatch_count
+            + self.users.dispatch_count
+            + self.watchlists.dispatch_count
+        )
+
+    def clear(self) -> None:
+        self.movies.clear()
+        self.users.clear()
+        self.watchlists.clear()
+
+
+repository_loader_context = solara.create_context(cast(Optional[RepositoryLoader], None))
+
+
+def use_repository_loader(
+    movie_repository: Optional[IMovieRepository] = None,
+    user_repository: Optional[IUserRepository] = None,
+    watchlist_repository: Optional[IWatchlistRepository] = None,
+) -> RepositoryLoader:
+    """
+    Hook creating a loader for the current render and providing it to the
+    child components, which get it with `use_loader()`.
+
+    Args:
+        movie_repository (Optional[IMovieRepository]): Defaults to the shared repository.
+        user_repository (Optional[IUserRepository]): Defaults to the shared repository.
+        watchlist_repository (Optional[IWatchlistRepository]): Defaults to the shared repository.
+
+    Returns:
+        RepositoryLoader: A loader whose cache lives as long as this render.
+    """
+    # A new loader on every render scopes the cache to a single render pass
+    loader = RepositoryLoader(
+        movie_repository or repositories.movie_repository,
+        user_repository or repositories.user_repository,
+        watchlist_repository or repositories.watchlist_repository,
+    )
+    solara.provide_context(repository_loader_context, loader)
+    return loader
+
+
+def use_loader() -> RepositoryLoader:
+    """
+    Hook returning the loader provided by a parent `use_repository_loader()`.
+    """
+    loader = solara.use_context(repository_loader_context)
+    if loader is None:
+        raise RuntimeError("use_loader() requires a parent component calling use_repository_loader()")
+    return loader
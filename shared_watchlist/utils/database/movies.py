@@ -1,6 +1,6 @@
 import re
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
 from pydantic import BaseModel, HttpUrl, PastDate, field_validator
 from pymongo import MongoClient
@@ -9,6 +9,8 @@ from pymongo.errors import DuplicateKeyError, PyMongoError
 from tmdbv3api import Movie as TMDbMovie
 
 from utils.database.db_config import db
+from utils.database.write_behind import WriteBehindQueue
+from utils.profiler import profiled_repository
 
 
 class Movie(BaseModel):
@@ -37,6 +39,11 @@ class IMovieRepository(ABC):
         """Retrieve a movie by its ID."""
         pass
 
+    @abstractmethod
+    def get_movies_by_ids(self, movie_ids: Iterable[int]) -> Dict[int, Movie]:
+        """Retrieve several movies with one query, keyed by ID."""
+        pass
+
     @abstractmethod
     def add_movie(self, movie: Movie) -> None:
         """Add a new movie to the database."""
@@ -58,29 +65,86 @@ class IMovieRepository(ABC):
         pass
 
 
+@profiled_repository
 class MongoMovieRepository(IMovieRepository):
-    def __init__(self, db_client: MongoClient, db_name: str, collection_name: str):
+    def __init__(
+        self,
+        db_client: MongoClient,
+        db_name: str,
+        collection_name: str,
+        write_behind: bool = False,
+    ):
         self.collection: Collection = db_client[db_name][collection_name]
         self.tmdb_movie = TMDbMovie()
+        self._insert_listeners: List[Callable[[Movie], None]] = []
+        # New movies are buffered and inserted in batches off the request path
+        self.write_behind: Optional[WriteBehindQueue] = None
+        if write_behind:
+            self.write_behind = WriteBehindQueue(
+                self.collection, on_written=self._notify_inserted
+            )
+            self.write_behind.start()
+
+    def subscribe(self, listener: Callable[[Movie], None]) -> None:
+        """Register a callback invoked with every newly inserted movie."""
+        self._insert_listeners.append(listener)
+
+    def _notify_inserted(self, movies: List[Movie]) -> None:
+        for movie in movies:
+            for listener in self._insert_listeners:
+                listener(movie)
 
     def get_all_movies(self) -> List[Movie]:
         cursor = self.collection.find()
-        return [Movie(**doc) for doc in cursor]
+        movies = [Movie(**doc) for doc in cursor]
+        if self.write_behind:
+            stored_ids = {movie.id for movie in movies}
+            movies.extend(
+                movie
+                for movie_id, movie in self.write_behind.pending().items()
+                if movie_id not in stored_ids
+            )
+        return movies
 
     def get_movie_by_id(self, movie_id: int) -> Optional[Movie]:
+        if self.write_behind:
+            pending = self.write_behind.get(movie_id)
+            if pending:
+                return pending
         movie = self.collection.find_one({"id": movie_id})
         return Movie(**movie) if movie else None
 
+    def get_movies_by_ids(self, movie_ids: Iterable[int]) -> Dict[int, Movie]:
+        movie_ids = list(movie_ids)
+        movies: Dict[int, Movie] = {}
+        if self.write_behind:
+            for movie_id in movie_ids:
+                pending = self.write_behind.get(movie_id)
+                if pending:
+                    movies[movie_id] = pending
+        missing = [movie_id for movie_id in movie_ids if movie_id not in movies]
+        if missing:
+            cursor = self.collection.find({"id": {"$in": missing}})
+            movies.update({doc["id"]: Movie(**doc) for doc in cursor})
+        return movies
+
     def add_movie(self, movie: Movie) -> None:
+        if self.write_behind:
+            # Listeners are notified by the queue once the movie is stored
+            self.write_behind.put(movie)
+            return
         try:
-            self.collection.insert_one(movie.dict())
+            self.collection.insert_one(movie.model_dump(mode="json"))
         except DuplicateKeyError:
-            pass  # Movie already exists
+            return  # Movie already exists
+        self._notify_inserted([movie])
 
     def delete_movie(self, movie_id: int) -> None:
+        # Waits for an in-flight write of the movie, so it cannot reappear
+        discarded = bool(self.write_behind) and self.write_behind.discard(movie_id)
         try:
             result = self.collection.delete_one({"id": movie_id})
-            if result.deleted_count == 0:
+            if result.deleted_count == 0 and not discarded:
                 raise ValueError(f"Movie with ID {movie_id} not found in the database.")
         except PyMongoError as e:
             raise RuntimeError(f"Failed to delete movie due to a database error: {e}")
@@ -0,0 +1,30 @@
+import threading
+from typing import Optional
+
+from utils.database.catalog import MovieCatalog
+from utils.database.db_config import MONGODB_DATABASE, MOVIE_WRITE_BEHIND, client
+from utils.database.movies import MongoMovieRepository
+from utils.database.users import MongoUserRepository
+from utils.database.wathclist import MongoWatchlistRepository
+
+# Process wide repositories shared by every session
+movie_repository = MongoMovieRepository(
+    client, MONGODB_DATABASE, "movies", write_behind=MOVIE_WRITE_BEHIND
+)
+user_repository = MongoUserRepository()
+watchlist_repository = MongoWatchlistRepository()
+
+_movie_catalog: Optional[MovieCatalog] = None
+_movie_catalog_lock = threading.Lock()
+
+
+def get_movie_catalog() -> MovieCatalog:
+    """
+    Return the process wide movie catalog, loading it from the movies
+    collection on first use.
+    """
+    global _movie_catalog
+    with _movie_catalog_lock:
+        if _movie_catalog is None:
+            _movie_catalog = MovieCatalog(movie_repository)
+        return _movie_catalog
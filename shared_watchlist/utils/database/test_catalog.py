@@ -0,0 +1,139 @@
+import threading
+import tracemalloc
+
+import pytest
+
+from utils.database.catalog import MovieCatalog
+from utils.database.movies import Movie
+
+
+class FakeRepository:
+    def __init__(self, collection):
+        self.collection = collection
+        self.listeners = []
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def get_movies_by_ids(self, movie_ids):
+        docs = self.collection.find({"id": {"$in": list(movie_ids)}})
+        return {doc["id"]: Movie(**doc) for doc in docs}
+
+
+@pytest.fixture
+def catalog(fake_collection, movie_docs):
+    fake_collection.docs = movie_docs
+    return MovieCatalog(FakeRepository(fake_collection))
+
+
+def test_loads_collection_on_creation(catalog):
+    assert sorted(catalog.ids.tolist()) == [1, 2, 3, 4]
+
+
+def test_title_filter_matches_past_sort_key_length(catalog):
+    rows = catalog.filter(title_contains="Fellowship")
+    assert catalog.ids[rows].tolist() == [1]
+
+
+@pytest.mark.parametrize(
+    "needle, expected",
+    [("alien", [2, 4]), ("RINGalien", []), ("gbrazil", []), ("brazil and more", []), ("é", [5])],
+)
+def test_title_filter_stays_within_one_title(catalog, needle, expected):
+    catalog.add(Movie(id=5, title="Amélie"))
+    rows = catalog.filter(title_contains=needle)
+    assert sorted(catalog.ids[rows].tolist()) == expected
+
+
+def test_year_filter_excludes_unknown_dates(catalog):
+    rows = catalog.filter(year_from=1979, year_to=1997)
+    assert sorted(catalog.ids[rows].tolist()) == [2, 4]
+
+
+def test_id_filters(catalog):
+    rows = catalog.filter(ids=[1, 2, 3], exclude_ids=[2])
+    assert sorted(catalog.ids[rows].tolist()) == [1, 3]
+
+
+def test_sort_by_title_is_case_insensitive(catalog):
+    assert catalog.ids[catalog.sort(by="title")].tolist() == [2, 4, 3, 1]
+    assert catalog.ids[catalog.sort(by="title", descending=True)].tolist() == [1, 3, 4, 2]
+
+
+@pytest.mark.parametrize("descending, expected", [(False, [2, 4, 1, 3]), (True, [1, 4, 2, 3])])
+def test_sort_by_release_date_puts_unknown_dates_last(catalog, descending, expected):
+    rows = catalog.sort(by="release_date", descending=descending)
+    assert catalog.ids[rows].tolist() == expected
+
+
+def test_sort_rejects_unknown_column(catalog):
+    with pytest.raises(ValueError):
+        catalog.sort(by="rating")
+
+
+@pytest.mark.parametrize("k, expected", [(0, []), (2, [1, 4]), (4, [1, 4, 2, 3]), (10, [1, 4, 2, 3])])
+def test_top_k(catalog, k, expected):
+    assert catalog.ids[catalog.top_k(k)].tolist() == expected
+
+
+def test_add_updates_existing_row(catalog):
+    catalog.add(Movie(id=2, title="Aliens", release_date="1986-07-18"))
+    assert len(catalog) == 4
+    assert catalog.ids[catalog.filter(title_contains="aliens")].tolist() == [2]
+
+
+def test_title_change_keeps_other_titles(catalog):
+    catalog.add(Movie(id=2, title="Alien: Director's Cut", release_date="1979-05-25"))
+    catalog.add(Movie(id=6, title="Heat"))
+    assert catalog.ids[catalog.filter(title_contains="director")].tolist() == [2]
+    assert catalog.ids[catalog.filter(title_contains="brazil")].tolist() == [3]
+    assert catalog.ids[catalog.filter(title_contains="heat")].tolist() == [6]
+    assert catalog.ids[catalog.sort(by="title")].tolist() == [4, 2, 3, 6, 1]
+
+
+def test_concurrent_adds_do_not_duplicate_rows(catalog):
+    movies = [Movie(id=100 + i % 50, title=f"Movie {i}") for i in range(2000)]
+    threads = [
+        threading.Thread(target=lambda chunk=movies[i::8]: [catalog.add(m) for m in chunk])
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(catalog) == 54
+    assert len(set(catalog.ids.tolist())) == 54
+
+
+def test_page_builds_movies_in_row_order(catalog):
+    rows = catalog.sort(by="title")
+    page = catalog.page(rows, offset=1, limit=2)
+    assert [movie.id for movie in page] == [4, 3]
+
+
+def test_memory_per_movie_is_an_order_of_magnitude_below_movie_objects(fake_collection):
+    fake_collection.docs = [
+        {
+            "id": movie_id,
+            "title": f"Synthetic Movie Title {movie_id}",
+            "release_date": "2001-12-19",
+            "poster_path": f"/poster-{movie_id}.jpg",
+        }
+        for movie_id in range(20_000)
+    ]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        movies = [Movie(**doc) for doc in fake_collection.docs]
+        movie_bytes = tracemalloc.get_traced_memory()[0] - before
+        del movies
+
+        before = tracemalloc.get_traced_memory()[0]
+        catalog = MovieCatalog(FakeRepository(fake_collection))
+        catalog_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert len(catalog) == 20_000
+    assert catalog_bytes * 10 <= movie_bytes
+    assert catalog.nbytes * 10 <= movie_bytes
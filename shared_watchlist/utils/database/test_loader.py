@@ -0,0 +1,67 @@
+import pytest
+
+from utils.database.loader import DataLoader, RepositoryLoader
+from utils.database.movies import Movie
+
+
+class CountingBatch:
+    def __init__(self, values):
+        self.values = values
+        self.batches = []
+
+    def __call__(self, keys):
+        self.batches.append(sorted(keys))
+        return {key: self.values[key] for key in keys if key in self.values}
+
+
+def test_primed_keys_are_fetched_in_one_batch():
+    batch = CountingBatch({1: "a", 2: "b", 3: "c"})
+    loader = DataLoader(batch)
+    loader.prime([1, 2, 3, 2])
+    assert [loader.load(key) for key in (3, 1, 2, 1)] == ["c", "a", "b", "a"]
+    assert batch.batches == [[1, 2, 3]]
+    assert loader.dispatch_count == 1
+
+
+def test_misses_are_cached():
+    batch = CountingBatch({})
+    loader = DataLoader(batch)
+    assert loader.load(7) is None
+    assert loader.load(7) is None
+    assert loader.dispatch_count == 1
+
+
+def test_load_many_only_fetches_uncached_keys():
+    batch = CountingBatch({1: "a", 2: "b"})
+    loader = DataLoader(batch)
+    loader.load(1)
+    assert loader.load_many([1, 2]) == ["a", "b"]
+    assert batch.batches == [[1], [2]]
+
+
+class FakeRepository:
+    def __init__(self):
+        self.calls = 0
+
+    def get_movies_by_ids(self, movie_ids):
+        self.calls += 1
+        return {movie_id: Movie(id=movie_id, title=f"Movie {movie_id}") for movie_id in movie_ids}
+
+    def get_users_by_ids(self, user_ids):
+        self.calls += 1
+        return {}
+
+    def get_watchlists_by_ids(self, watchlist_ids):
+        self.calls += 1
+        return {}
+
+
+def test_repository_loader_keeps_repository_errors():
+    repository = FakeRepository()
+    loader = RepositoryLoader(repository, repository, repository)
+    assert loader.get_movie_by_id(1).title == "Movie 1"
+    with pytest.raises(ValueError):
+        loader.get_user("missing")
+    with pytest.raises(ValueError):
+        loader.get_watchlist_by_id("missing")
+    assert loader.dispatch_count() == 3
@@ -0,0 +1,139 @@
+import threading
+from datetime import date
+
+import pytest
+from bson.errors import InvalidDocument
+from pymongo.errors import AutoReconnect
+
+from utils.database.movies import MongoMovieRepository, Movie
+from utils.database.write_behind import WriteBehindQueue
+
+
+def movie(movie_id: int, title: str = "Movie") -> Movie:
+    return Movie(id=movie_id, title=f"{title} {movie_id}", release_date=date(2000, 1, 1))
+
+
+@pytest.fixture
+def queue(fake_collection):
+    queue = WriteBehindQueue(fake_collection, max_batch_size=10, flush_interval=60)
+    yield queue
+    queue.stop()
+
+
+def test_deduplicates_by_id_and_keeps_latest(queue, fake_collection):
+    queue.start()
+    queue.put(movie(1, "Old"))
+    queue.put(movie(1, "New"))
+    queue.put(movie(2))
+    assert queue.get(1).title == "New 1"
+    queue.stop()
+    assert sorted(doc["title"] for doc in fake_collection.docs) == ["Movie 2", "New 1"]
+    assert fake_collection.insert_many_calls == 1
+
+
+def test_documents_are_stored_as_json(queue, fake_collection):
+    queue.put(movie(1))
+    assert fake_collection.docs[0]["release_date"] == "2000-01-01"
+
+
+def test_stop_flushes_pending_documents(queue, fake_collection):
+    queue.start()
+    for movie_id in range(5):
+        queue.put(movie(movie_id))
+    assert fake_collection.docs == []
+    queue.stop()
+    assert len(fake_collection.docs) == 5
+    assert queue.metrics()["queue_depth"] == 0
+
+
+def test_full_buffer_pushes_back(fake_collection):
+    fake_collection.release = threading.Event()
+    queue = WriteBehindQueue(
+        fake_collection, max_batch_size=1, max_pending=1, put_timeout=0.1
+    )
+    queue.start()
+    queue.put(movie(1))
+    assert fake_collection.inserting.wait(5)
+    queue.put(movie(2))
+    with pytest.raises(RuntimeError):
+        queue.put(movie(3))
+    fake_collection.release.set()
+    queue.stop()
+    assert sorted(doc["id"] for doc in fake_collection.docs) == [1, 2]
+
+
+@pytest.mark.parametrize("error", [InvalidDocument("bad"), AutoReconnect("down"), ValueError("boom")])
+def test_failed_flush_is_retried_and_worker_survives(queue, fake_collection, error):
+    fake_collection.insert_errors = [error]
+    written = []
+    queue.on_written = written.extend
+    queue.start()
+    queue.put(movie(1))
+    queue.flush()
+    assert queue.get(1) is not None
+    assert queue.metrics()["failed_documents"] == 1
+    queue.flush()
+    assert [doc["id"] for doc in fake_collection.docs] == [1]
+    assert [document.id for document in written] == [1]
+    queue.put(movie(2))
+    queue.stop()
+    assert sorted(doc["id"] for doc in fake_collection.docs) == [1, 2]
+
+
+def test_newer_version_survives_failed_in_flight_write(fake_collection):
+    fake_collection.release = threading.Event()
+    fake_collection.insert_errors = [AutoReconnect("down")]
+    queue = WriteBehindQueue(fake_collection, max_batch_size=1)
+    queue.start()
+    queue.put(movie(1, "Old"))
+    assert fake_collection.inserting.wait(5)
+    queue.put(movie(1, "New"))
+    assert queue.get(1).title == "New 1"
+    fake_collection.release.set()
+    queue.stop()
+    assert [doc["title"] for doc in fake_collection.docs] == ["New 1"]
+
+
+def test_permanent_failures_are_dead_lettered(fake_collection):
+    fake_collection.insert_errors = [AutoReconnect("down")] * 3
+    queue = WriteBehindQueue(fake_collection, max_retries=2)
+    queue.put(movie(1))
+    queue.stop()
+    assert list(queue.dead_letters()) == [1]
+    assert queue.get(1) is None
+    assert fake_collection.docs == []
+
+
+def test_discard_waits_for_in_flight_write(fake_collection):
+    fake_collection.release = threading.Event()
+    queue = WriteBehindQueue(fake_collection, max_batch_size=1)
+    queue.start()
+    queue.put(movie(1))
+    assert fake_collection.inserting.wait(5)
+    result = []
+    discarding = threading.Thread(target=lambda: result.append(queue.discard(1)))
+    discarding.start()
+    discarding.join(0.1)
+    assert discarding.is_alive()
+    fake_collection.release.set()
+    discarding.join(5)
+    assert result == [False]
+    assert [doc["id"] for doc in fake_collection.docs] == [1]
+    queue.stop()
+
+
+def test_repository_notifies_listeners_once_written(fake_collection):
+    repository = MongoMovieRepository({"db": {"movies": fake_collection}}, "db", "movies")
+    repository.write_behind = WriteBehindQueue(
+        fake_collection, flush_interval=60, on_written=repository._notify_inserted
+    )
+    repository.write_behind.start()
+    inserted = []
+    repository.subscribe(inserted.append)
+    repository.add_movie(movie(1))
+    assert inserted == []
+    assert repository.get_movie_by_id(1).id == 1
+    repository.write_behind.stop()
+    assert [m.id for m in inserted] == [1]
+    repository.delete_movie(1)
+    assert fake_collection.docs == []
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, EmailStr, HttpUrl
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterable, List
 from abc import ABC, abstractmethod
 from utils.database.db_config import db
+from utils.profiler import profiled_repository
 
 """
 'userinfo': {
@@ -54,6 +55,10 @@ class IUserRepository(ABC):
     def get_user(self, user_id: str) -> User:
         pass
 
+    @abstractmethod
+    def get_users_by_ids(self, user_ids: Iterable[str]) -> Dict[str, User]:
+        pass
+
     @abstractmethod
     def add_user(self, user: User) -> None:
         pass
@@ -75,6 +80,7 @@ class IUserRepository(ABC):
         pass
 
 
+@profiled_repository
 class MongoUserRepository(IUserRepository):
     def __init__(self):
         self.collection = db["users"]
@@ -98,6 +104,10 @@ class MongoUserRepository(IUserRepository):
             raise ValueError(f"User with id {user_id} not found")
         return User(**user_data)
 
+    def get_users_by_ids(self, user_ids: Iterable[str]) -> Dict[str, User]:
+        results = self.collection.find({"id": {"$in": list(user_ids)}})
+        return {user_data["id"]: User(**user_data) for user_data in results}
+
     def add_user(self, user: User) -> None:
         if self.collection.find_one({"id": user.id}):
             raise ValueError(f"User with id {user.id} already exists")
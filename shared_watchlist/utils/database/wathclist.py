@@ -1,10 +1,11 @@
 from pymongo import MongoClient
 from bson.objectid import ObjectId
 from abc import ABC, abstractmethod
-from typing import List
-from db_config import db
+from typing import Dict, Iterable, List
+from utils.database.db_config import db
+from utils.profiler import profiled_repository
 from pydantic import BaseModel
-from movies import Movie
+from utils.database.movies import Movie
 
 
 # Initialize MongoDB client
@@ -53,6 +54,10 @@ class IWatchlistRepository(ABC):
     def get_watchlist_by_id(self, watchlist_id: int) -> Watchlist:
         pass
 
+    @abstractmethod
+    def get_watchlists_by_ids(self, watchlist_ids: Iterable[str]) -> Dict[str, Watchlist]:
+        pass
+
     @abstractmethod
     def create_watchlist(self, user_id: str, watchlist: Watchlist) -> None:
         pass
@@ -68,6 +73,7 @@ class IWatchlistRepository(ABC):
         pass
 
 
+@profiled_repository
 class MongoWatchlistRepository(IWatchlistRepository):
     def __init__(self):
         self.collection = db["watchlist"]
@@ -82,6 +88,11 @@ class MongoWatchlistRepository(IWatchlistRepository):
             raise ValueError("Watchlist not found")
         return Watchlist(**watchlist)
 
+    def get_watchlists_by_ids(self, watchlist_ids: Iterable[str]) -> Dict[str, Watchlist]:
+        object_ids = [ObjectId(watchlist_id) for watchlist_id in watchlist_ids]
+        watchlists = self.collection.find({"_id": {"$in": object_ids}})
+        return {str(watchlist["_id"]): Watchlist(**watchlist) for watchlist in watchlists}
+
     def create_watchlist(self, user_id: str, watchlist: Watchlist) -> None:
         watchlist_data = watchlist.dict()
         watchlist_data["owner_id"] = user_id
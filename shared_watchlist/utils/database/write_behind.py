@@ -0,0 +1,292 @@
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+# Mongo error code for duplicate key violations
+DUPLICATE_KEY_ERROR = 11000
+
+
+class WriteBehindQueue:
+    """
+    Buffer inserts of documents keyed by `id` and write them in the background.
+
+    Documents are deduplicated by id while they wait, and flushed with a single
+    unordered `insert_many` when `max_batch_size` documents are pending or
+    `flush_interval` seconds have passed. `put` blocks once `max_pending`
+    documents are waiting, so a slow database pushes back on producers
+    instead of growing the buffer without bound.
+
+    Documents that fail to write are retried on the next flush, up to
+    `max_retries` times, and then kept in `dead_letters()`. `on_written` is
+    called with every batch of documents that is stored in the database.
+    """
+
+    def __init__(
+        self,
+        collection: Collection,
+        max_batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_pending: int = 1000,
+        put_timeout: float = 5.0,
+        max_retries: int = 3,
+        on_written: Optional[Callable[[List[BaseModel]], None]] = None,
+    ):
+        self.collection = collection
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.on_written = on_written
+
+        self._pending: "OrderedDict[int, BaseModel]" = OrderedDict()
+        self._in_flight: Dict[int, BaseModel] = {}
+        self._retrying: Dict[int, BaseModel] = {}
+        self._attempts: Dict[int, int] = {}
+        self._dead_letters: Dict[int, BaseModel] = {}
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = False
+
+        self._flush_count = 0
+        self._flushed_documents = 0
+        self._failed_documents = 0
+        self._last_flush_seconds = 0.0
+        self._max_flush_seconds = 0.0
+        self._total_flush_seconds = 0.0
+
+    def start(self) -> None:
+        """
+        Start the background flush worker and flush on interpreter shutdown.
+        """
+        with self._condition:
+            if self._worker is not None:
+                return
+            self._stopping = False
+            self._worker = threading.Thread(
+                target=self._run, name="write-behind", daemon=True
+            )
+            self._worker.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """
+        Stop the worker after writing every pending document, retrying
+        failed documents until they are written or dead-lettered.
+        """
+        with self._condition:
+            worker = self._worker
+            self._stopping = True
+            self._condition.notify_all()
+        if worker is not None:
+            worker.join()
+        with self._condition:
+            self._worker = None
+        # Anything enqueued without a running worker is written here
+        while True:
+            self.flush()
+            with self._condition:
+                self._condition.wait_for(lambda: not self._in_flight)
+                if not self._pending and not self._retrying:
+                    break
+        if self._dead_letters:
+            logger.error("%d documents could not be written", len(self._dead_letters))
+
+    def put(self, document: BaseModel) -> None:
+        """
+        Enqueue a document for insertion.
+
+        Args:
+            document (BaseModel): The document to insert, must have an `id`.
+
+        Raises:
+            RuntimeError: If the buffer stays full for `put_timeout` seconds.
+        """
+        with self._condition:
+            # A document that is being written is queued again, so this
+            # version wins over the in-flight copy if that write fails
+            if document.id in self._retrying:
+                self._retrying[document.id] = document
+                return
+            if document.id not in self._pending:
+                has_room = self._condition.wait_for(
+                    lambda: len(self._pending) + len(self._retrying) < self.max_pending,
+                    self.put_timeout,
+                )
+                if not has_room:
+                    raise RuntimeError(
+                        f"Write-behind buffer is full ({self.max_pending} documents pending)"
+                    )
+            self._pending[document.id] = document
+            self._dead_letters.pop(document.id, None)
+            if len(self._pending) >= self.max_batch_size:
+                self._condition.notify_all()
+            synchronous = self._worker is None
+        if synchronous:
+            # Without a running worker the queue degrades to write-through
+            self.flush()
+
+    def get(self, document_id: int) -> Optional[BaseModel]:
+        """
+        Return a document that is not written to the database yet.
+        """
+        with self._condition:
+            for buffer in (self._pending, self._in_flight, self._retrying):
+                document = buffer.get(document_id)
+                if document is not None:
+                    return document
+            return None
+
+    def pending(self) -> Dict[int, BaseModel]:
+        """
+        Return a snapshot of every document not written to the database yet.
+        """
+        with self._condition:
+            return {**self._retrying, **self._in_flight, **self._pending}
+
+    def dead_letters(self) -> Dict[int, BaseModel]:
+        """
+        Return the documents that failed to write `max_retries` times.
+        """
+        with self._condition:
+            return dict(self._dead_letters)
+
+    def discard(self, document_id: int) -> bool:
+        """
+        Drop a document that is not written yet, returns True if it was
+        dropped. If the document is being written right now, waits for that
+        write to finish first, so a following delete sees the stored document.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: document_id not in self._in_flight)
+            removed = False
+            for buffer in (self._pending, self._retrying, self._dead_letters):
+                removed = buffer.pop(document_id, None) is not None or removed
+            self._attempts.pop(document_id, None)
+            if removed:
+                self._condition.notify_all()
+            return removed
+
+    def flush(self) -> None:
+        """
+        Write every pending document synchronously. Documents that failed
+        an earlier flush are attempted once more.
+        """
+        with self._condition:
+            for document_id, document in self._retrying.items():
+                self._pending.setdefault(document_id, document)
+            self._retrying.clear()
+        while self._flush_batch():
+            pass
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Return queue depth and flush latency statistics.
+        """
+        with self._condition:
+            return {
+                "queue_depth": len(self._pending),
+                "in_flight": len(self._in_flight),
+                "retrying": len(self._retrying),
+                "dead_letters": len(self._dead_letters),
+                "flush_count": self._flush_count,
+                "flushed_documents": self._flushed_documents,
+                "failed_documents": self._failed_documents,
+                "last_flush_seconds": self._last_flush_seconds,
+                "max_flush_seconds": self._max_flush_seconds,
+                "avg_flush_seconds": (
+                    self._total_flush_seconds / self._flush_count
+                    if self._flush_count
+                    else 0.0
+                ),
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopping
+                    or len(self._pending) >= self.max_batch_size,
+                    self.flush_interval,
+                )
+                stopping = self._stopping
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed")
+            if stopping:
+                return
+
+    def _flush_batch(self) -> bool:
+        with self._condition:
+            if not self._pending or self._in_flight:
+                return False
+            while self._pending and len(self._in_flight) < self.max_batch_size:
+                document_id, document = self._pending.popitem(last=False)
+                self._in_flight[document_id] = document
+            batch = list(self._in_flight.values())
+            self._condition.notify_all()
+
+        started = time.perf_counter()
+        failed: List[BaseModel] = []
+        try:
+            self.collection.insert_many(
+                [document.model_dump(mode="json") for document in batch], ordered=False
+            )
+        except BulkWriteError as e:
+            # Documents that are already stored are not failures
+            failed = [
+                batch[error["index"]]
+                for error in e.details.get("writeErrors", [])
+                if error.get("code") != DUPLICATE_KEY_ERROR
+            ]
+            if failed:
+                logger.error("Failed to flush %d of %d documents", len(failed), len(batch))
+        except Exception:
+            failed = batch
+            logger.exception("Failed to flush %d documents", len(batch))
+        finally:
+            elapsed = time.perf_counter() - started
+            failed_ids = {document.id for document in failed}
+            written = [document for document in batch if document.id not in failed_ids]
+            with self._condition:
+                self._in_flight.clear()
+                for document in written:
+                    self._attempts.pop(document.id, None)
+                for document in failed:
+                    self._requeue(document)
+                self._flush_count += 1
+                self._flushed_documents += len(written)
+                self._failed_documents += len(failed)
+                self._last_flush_seconds = elapsed
+                self._max_flush_seconds = max(self._max_flush_seconds, elapsed)
+                self._total_flush_seconds += elapsed
+                self._condition.notify_all()
+
+        if written and self.on_written:
+            try:
+                self.on_written(written)
+            except Exception:
+                logger.exception("Write-behind on_written callback failed")
+        return True
+
+    def _requeue(self, document: BaseModel) -> None:
+        # Callers hold the lock
+        if document.id in self._pending:
+            return  # A newer version is already waiting
+        attempts = self._attempts.get(document.id, 0) + 1
+        if attempts > self.max_retries:
+            self._attempts.pop(document.id, None)
+            self._dead_letters[document.id] = document
+            return
+        self._attempts[document.id] = attempts
+        self._retrying[document.id] = document
@@ -0,0 +1,279 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import reacton.core
+import solara
+from solara import Reactive
+
+# Profiling is switched on per process, e.g. WATCHLIST_PROFILE=1 solara run app.py
+PROFILING_ENABLED = os.environ.get("WATCHLIST_PROFILE", "") == "1"
+
+# Comma separated emails of the users allowed to open /debug/perf
+PROFILING_ADMINS = {
+    email.strip().lower()
+    for email in os.environ.get("WATCHLIST_ADMINS", "").split(",")
+    if email.strip()
+}
+
+# Maximum number of trace events kept for the flamegraph export
+MAX_TRACE_EVENTS = 50_000
+
+
+class RenderProfiler:
+    """
+    Collects render and repository timings for the Solara components.
+
+    Every component render and repository call becomes a complete ("X")
+    trace event, so the export can be opened in Perfetto, chrome://tracing
+    or speedscope as a flamegraph. Reactive variable changes are counted and
+    the renders of the render pass that follows a change, in the same
+    session, are attributed to it as fan-out.
+    """
+
+    def __init__(
+        self,
+        render_pass: Optional[Callable[[], Optional[Tuple[int, int]]]] = None,
+    ):
+        self._render_pass = render_pass or _current_render_pass
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started = time.perf_counter()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._renders: Dict[str, Dict[str, float]] = defaultdict(_new_stats)
+            self._calls: Dict[str, Dict[str, float]] = defaultdict(_new_call_stats)
+            self._render_call_seconds: Dict[str, float] = defaultdict(float)
+            self._changes: Dict[str, int] = defaultdict(int)
+            self._fan_out: Dict[str, Dict[str, int]] = defaultdict(
+                lambda: defaultdict(int)
+            )
+            self._events: deque = deque(maxlen=MAX_TRACE_EVENTS)
+
+    def record_change(self, name: str) -> None:
+        """
+        Register that a reactive variable changed, the renders of the next
+        render pass of the same session are attributed to it.
+        """
+        self._local.change = (name, self._render_pass())
+        self._local.change_pass = None
+        with self._lock:
+            self._changes[name] += 1
+
+    def render(self, component: str, func: Callable, *args, **kwargs) -> Any:
+        change = self._attributed_change()
+        stack = self._stack()
+        stack.append(component)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            with self._lock:
+                _update_stats(self._renders[component], elapsed)
+                if change:
+                    self._fan_out[change][component] += 1
+                self._add_event(component, "render", started, elapsed)
+
+    def call(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        # Time spent in nested repository calls, per open call on this thread
+        frames = self._call_frames()
+        frames.append(0.0)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = frames.pop()
+            if frames:
+                frames[-1] += elapsed
+            stack = self._stack()
+            with self._lock:
+                stats = self._calls[name]
+                _update_stats(stats, elapsed)
+                stats["self_seconds"] += elapsed - nested
+                # Only outermost calls count towards the component, nested
+                # calls are already included in their caller's time
+                if stack and not frames:
+                    self._render_call_seconds[stack[-1]] += elapsed
+                self._add_event(name, "repository", started, elapsed)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the collected statistics as a JSON serializable dict.
+        """
+        with self._lock:
+            return {
+                "renders": {
+                    component: {
+                        **stats,
+                        "repository_seconds": self._render_call_seconds[component],
+                    }
+                    for component, stats in self._renders.items()
+                },
+                "repository_calls": {name: dict(stats) for name, stats in self._calls.items()},
+                "reactive_changes": {
+                    name: {"changes": count, "fan_out": dict(self._fan_out[name])}
+                    for name, count in self._changes.items()
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.summary(), indent=2)
+
+    def to_trace(self) -> str:
+        """
+        Export the trace events in the Chrome trace event format.
+        """
+        with self._lock:
+            events = list(self._events)
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
+
+    def _attributed_change(self) -> Optional[str]:
+        change = getattr(self._local, "change", None)
+        current = self._render_pass()
+        if change is None or current is None:
+            return None
+        name, origin = change
+        if origin is not None:
+            if origin[0] != current[0]:
+                # Another session rendered on this thread
+                self._local.change = None
+                return None
+            if current[1] <= origin[1]:
+                # Still the render pass during which the change was made
+                return None
+        bound = self._local.change_pass
+        if bound is None:
+            self._local.change_pass = current
+            return name
+        if bound == current:
+            return name
+        # The render pass triggered by the change is over
+        self._local.change = None
+        return None
+
+    def _call_frames(self) -> List[float]:
+        frames = getattr(self._local, "call_frames", None)
+        if frames is None:
+            frames = self._local.call_frames = []
+        return frames
+
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add_event(self, name: str, category: str, started: float, elapsed: float) -> None:
+        self._events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (started - self._started) * 1e6,
+                "dur": elapsed * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+        )
+
+
+def _new_stats() -> Dict[str, float]:
+    return {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+
+
+def _new_call_stats() -> Dict[str, float]:
+    return {**_new_stats(), "self_seconds": 0.0}
+
+
+def _current_render_pass() -> Optional[Tuple[int, int]]:
+    # Identifies the render context (session) and its current render pass
+    rc = reacton.core.get_render_context(required=False)
+    if rc is None:
+        return None
+    return id(rc), rc.render_count
+
+
+def _update_stats(stats: Dict[str, float], elapsed: float) -> None:
+    stats["count"] += 1
+    stats["total_seconds"] += elapsed
+    stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+
+profiler = RenderProfiler()
+
+
+def profiled(func: Callable) -> Callable:
+    """
+    Decorator recording render counts and durations of a component.
+
+    Apply it below `@solara.component`. When profiling is disabled the
+    component function is returned untouched.
+
+    Args:
+        func (Callable): The component function to profile.
+
+    Returns:
+        Callable: The instrumented component function.
+    """
+    if not PROFILING_ENABLED:
+        return func
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return profiler.render(name, func, *args, **kwargs)
+
+    return wrapper
+
+
+def profiled_repository(cls: type) -> type:
+    """
+    Class decorator timing every public method of a repository.
+
+    When profiling is disabled the class is returned untouched.
+    """
+    if not PROFILING_ENABLED:
+        return cls
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not callable(value):
+            continue
+        setattr(cls, attr, _profiled_method(f"{cls.__name__}.{attr}", value))
+    return cls
+
+
+def _profiled_method(name: str, method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        return profiler.call(name, method, *args, **kwargs)
+
+    return wrapper
+
+
+def use_profiled_reactive(name: str, reactive: Reactive) -> None:
+    """
+    Hook counting changes of a reactive variable within the current session.
+
+    Args:
+        name (str): The name shown on the profiling page.
+        reactive (Reactive): The reactive variable to watch.
+    """
+    if not PROFILING_ENABLED:
+        return
+
+    def subscribe():
+        return reactive.subscribe(lambda _: profiler.record_change(name))
+
+    solara.use_effect(subscribe, [reactive])
+
+
+def is_profiling_admin(email: Optional[str]) -> bool:
+    return bool(email) and email.lower() in PROFILING_ADMINS
@@ -0,0 +1,78 @@
+import json
+import time
+
+from utils.profiler import RenderProfiler
+
+
+class FakeRenderPass:
+    def __init__(self):
+        self.current = None
+
+    def __call__(self):
+        return self.current
+
+
+def test_render_stats_are_aggregated():
+    profiler = RenderProfiler()
+    for _ in range(3):
+        profiler.render("Page", lambda: None)
+    stats = profiler.summary()["renders"]["Page"]
+    assert stats["count"] == 3
+    assert stats["max_seconds"] <= stats["total_seconds"]
+
+
+def test_nested_repository_calls_are_not_counted_twice():
+    profiler = RenderProfiler()
+
+    def inner():
+        time.sleep(0.01)
+
+    def outer():
+        profiler.call("inner", inner)
+        time.sleep(0.01)
+
+    profiler.render("Page", lambda: profiler.call("outer", outer))
+    summary = profiler.summary()
+    outer_stats = summary["repository_calls"]["outer"]
+    inner_stats = summary["repository_calls"]["inner"]
+    assert outer_stats["total_seconds"] >= inner_stats["total_seconds"] + 0.01
+    assert abs(outer_stats["self_seconds"] - (outer_stats["total_seconds"] - inner_stats["total_seconds"])) < 1e-6
+    assert summary["renders"]["Page"]["repository_seconds"] == outer_stats["total_seconds"]
+
+
+def test_fan_out_is_limited_to_the_next_render_pass():
+    render_pass = FakeRenderPass()
+    profiler = RenderProfiler(render_pass)
+    render_pass.current = (1, 5)
+    profiler.record_change("user")
+    # Renders of the pass that made the change are not caused by it
+    profiler.render("Early", lambda: None)
+    render_pass.current = (1, 6)
+    profiler.render("AppBar", lambda: None)
+    profiler.render("Page", lambda: None)
+    render_pass.current = (1, 7)
+    profiler.render("Page", lambda: None)
+
+    changes = profiler.summary()["reactive_changes"]["user"]
+    assert changes == {"changes": 1, "fan_out": {"AppBar": 1, "Page": 1}}
+
+
+def test_fan_out_ignores_other_sessions_on_the_same_thread():
+    render_pass = FakeRenderPass()
+    profiler = RenderProfiler(render_pass)
+    render_pass.current = (1, 5)
+    profiler.record_change("user")
+    render_pass.current = (2, 9)
+    profiler.render("Page", lambda: None)
+    render_pass.current = (1, 6)
+    profiler.render("Page", lambda: None)
+    assert profiler.summary()["reactive_changes"]["user"]["fan_out"] == {}
+
+
+def test_trace_export_has_complete_events():
+    profiler = RenderProfiler()
+    profiler.render("Page", lambda: profiler.call("get_user", lambda: None))
+    events = json.loads(profiler.to_trace())["traceEvents"]
+    assert [(event["name"], event["ph"]) for event in events] == [("get_user", "X"), ("Page", "X")]
+    profiler.reset()
+    assert profiler.summary()["renders"] == {}